@@ -0,0 +1,427 @@
+import streamlit as st
+import firebase_admin
+from firebase_admin import credentials, db
+import pandas as pd
+from streamlit_autorefresh import st_autorefresh
+import numpy as np
+from datetime import datetime
+import time
+import itertools
+import uuid
+from collections import deque
+from functools import lru_cache
+
+# Number of readings kept in the level history
+HISTORY_SIZE = 100
+# Column dtypes of the level history, declared once so pandas never infers them
+TIME_DTYPE = np.dtype('datetime64[ns]')
+LEVEL_DTYPE = np.dtype(np.float64)
+# Level changes smaller than this (below the 1 mm sensor resolution) are ignored
+LEVEL_EPSILON = 0.05
+# Upper bound in seconds for the adaptive refresh interval
+MAX_REFRESH_INTERVAL = 60
+
+# Cleared once /sensor/updated_at is found missing, so polling stops
+# reading a node the firmware does not write
+_updated_at_available = True
+
+def init_state():
+    # Initialize session state
+    if 'buf_t' not in st.session_state:
+        # Fixed-size ring buffer holding the level history. Every slot is
+        # mirrored HISTORY_SIZE further on, so the readings are always one
+        # contiguous slice
+        st.session_state.buf_t = np.empty(2 * HISTORY_SIZE, dtype=TIME_DTYPE)
+        st.session_state.buf_v = np.empty(2 * HISTORY_SIZE, dtype=LEVEL_DTYPE)
+        st.session_state.buf_n = 0
+        st.session_state.buf_head = 0
+    if 'last_update' not in st.session_state:
+        st.session_state.last_update = None
+    if 'auto_refresh' not in st.session_state:
+        st.session_state.auto_refresh = True
+    if 'last_count' not in st.session_state:
+        st.session_state.last_count = None
+    if 'listener_id' not in st.session_state:
+        st.session_state.listener_id = None
+    if 'last_seq' not in st.session_state:
+        st.session_state.last_seq = 0
+    if 'last_change_ts' not in st.session_state:
+        st.session_state.last_change_ts = None
+    if 'ewma_gap' not in st.session_state:
+        st.session_state.ewma_gap = None
+    if 'tail_repeat' not in st.session_state:
+        st.session_state.tail_repeat = False
+    if 'tick_level' not in st.session_state:
+        st.session_state.tick_level = None
+        st.session_state.prev_tick_level = None
+    if 'last_ts' not in st.session_state:
+        st.session_state.last_ts = None
+    if 'last_data' not in st.session_state:
+        st.session_state.last_data = None
+
+def clear_history():
+    st.session_state.buf_n = 0
+    st.session_state.buf_head = 0
+    st.session_state.tail_repeat = False
+    st.session_state.tick_level = None
+    st.session_state.prev_tick_level = None
+
+def touch_last_reading(timestamp):
+    # Move the newest reading, and its mirror, forward in time
+    last = (st.session_state.buf_head - 1) % HISTORY_SIZE
+    st.session_state.buf_t[last] = timestamp
+    st.session_state.buf_t[last + HISTORY_SIZE] = timestamp
+
+def append_readings(times, levels):
+    # Write a batch in place, overwriting the oldest slots and their mirrors
+    count = min(len(levels), HISTORY_SIZE)
+    times = times[len(times) - count:]
+    levels = levels[len(levels) - count:]
+    head = st.session_state.buf_head
+    slots = (head + np.arange(count)) % HISTORY_SIZE
+    for buf, values in ((st.session_state.buf_t, times), (st.session_state.buf_v, levels)):
+        buf[slots] = values
+        buf[slots + HISTORY_SIZE] = values
+    st.session_state.buf_head = (head + count) % HISTORY_SIZE
+    st.session_state.buf_n = min(st.session_state.buf_n + count, HISTORY_SIZE)
+
+def history_frame():
+    # Materialize the buffered readings, oldest first, from views of the buffer
+    n = st.session_state.buf_n
+    start = (st.session_state.buf_head - n) % HISTORY_SIZE
+    times = st.session_state.buf_t[start:start + n]
+    levels = st.session_state.buf_v[start:start + n]
+    return pd.DataFrame({"Time": times, "Distance": levels}, copy=False)
+
+def history_signature():
+    # Cheap key that changes whenever the buffered history does
+    n = st.session_state.buf_n
+    head = st.session_state.buf_head
+    first = (head - n) % HISTORY_SIZE
+    last = (head - 1) % HISTORY_SIZE
+    return (
+        n,
+        int(st.session_state.buf_t[first].view('i8')),
+        int(st.session_state.buf_t[last].view('i8')),
+        float(st.session_state.buf_v[last])
+    )
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _csv_bytes(signature, _df):
+    return _df.to_csv(index=False).encode('utf-8')
+
+@st.cache_resource(show_spinner=False)
+def _firebase_app():
+    # Initialize Firebase only if it hasn't been initialized
+    try:
+        return firebase_admin.get_app()
+    except ValueError:
+        cred = credentials.Certificate("firebase-adminsdk.json")
+        return firebase_admin.initialize_app(cred, {
+            'databaseURL': 'https://smart-container-46c13-default-rtdb.firebaseio.com/'
+        })
+
+@st.cache_resource(show_spinner=False)
+def _db_ref(path):
+    # One Reference object per path, shared by every rerun and session
+    return db.reference(path)
+
+# Cached reads are keyed on (interval, bucket) and shared by every session,
+# so leave room for a few viewers on different intervals
+@st.cache_data(max_entries=32, show_spinner=False)
+def _fetch_updated_at(interval, bucket):
+    return _db_ref('/sensor/updated_at').get()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _fetch_data_cached(interval, bucket):
+    return _db_ref('/sensor/distance').get()
+
+def fetch_data(now):
+    # Reruns within the same update interval share a single Firebase read
+    interval = max(1, st.session_state.update_interval)
+    bucket = int(now // interval)
+
+    # The sensor stamps /sensor/updated_at on every write; if it has not
+    # moved, reuse the last value instead of downloading it again
+    global _updated_at_available
+    updated_at = None
+    if _updated_at_available:
+        updated_at = _fetch_updated_at(interval, bucket)
+        if updated_at is None:
+            _updated_at_available = False
+    if updated_at is not None and updated_at == st.session_state.last_ts:
+        return st.session_state.last_data
+    data = _fetch_data_cached(interval, bucket)
+    st.session_state.last_ts = updated_at
+    st.session_state.last_data = data
+    return data
+
+def _close_listener(listener):
+    # Stop the replaced listener's SSE connection and background thread
+    listener[2].close()
+
+@st.cache_resource(show_spinner=False, on_release=_close_listener)
+def _start_listener():
+    # Stream sensor updates into a shared buffer instead of polling for them
+    events = deque(maxlen=HISTORY_SIZE)
+    seq = itertools.count(1)
+
+    def on_event(event):
+        events.append((next(seq), datetime.now(), event.data))
+
+    registration = _db_ref('/sensor/distance').listen(on_event)
+    # Sequence numbers restart with every listener, so tag it with an id
+    return uuid.uuid4().hex, events, registration
+
+def new_events(listener_id, events):
+    # Events are shared by all sessions, so each one tracks what it has seen
+    if st.session_state.listener_id != listener_id:
+        st.session_state.listener_id = listener_id
+        st.session_state.last_seq = 0
+    last_seq = st.session_state.last_seq
+    pending = [event for event in list(events) if event[0] > last_seq]
+    if pending:
+        st.session_state.last_seq = pending[-1][0]
+    return [(timestamp, data) for _, timestamp, data in pending]
+
+@lru_cache(maxsize=256)
+def parse_distance(data):
+    # Sensor readings repeat a small set of raw values, so parse each one once.
+    # This module is imported once, so the cache outlives individual reruns
+    distance = float(data)
+    if not np.isfinite(distance):
+        raise ValueError(f"non-finite distance {data!r}")
+    return distance
+
+def container_levels(distances):
+    # Map sensor distances (cm) to container levels (%), element-wise
+    return np.clip((120.0 - distances) * (100 / 80), 0.0, 100.0)
+
+def record_readings(samples):
+    # Parse the new (timestamp, data) samples, then convert and append them in one batch
+    times = []
+    distances = []
+    for timestamp, data in samples:
+        if data is None:
+            continue
+        try:
+            distances.append(parse_distance(data))
+        except (TypeError, ValueError) as e:
+            st.error(f"Error processing data: {str(e)}")
+            continue
+        times.append(timestamp)
+
+    if not times:
+        return
+    st.session_state.last_update = times[-1]
+
+    # Calculate container levels
+    levels = container_levels(np.fromiter(distances, dtype=LEVEL_DTYPE, count=len(distances)))
+
+    # Compare against the last level kept, so slow drift still registers
+    # however the samples happen to be batched. A run of repeats is kept as
+    # one trailing row at the same level whose timestamp moves forward, so
+    # the chart shows the plateau instead of a ramp to the next change
+    last_level = None
+    if st.session_state.buf_n:
+        last_level = st.session_state.buf_v[(st.session_state.buf_head - 1) % HISTORY_SIZE]
+    tail_repeat = st.session_state.tail_repeat
+    new_times = []
+    new_levels = []
+    for timestamp, level in zip(times, levels.tolist()):
+        if last_level is None or abs(level - last_level) >= LEVEL_EPSILON:
+            new_times.append(timestamp)
+            new_levels.append(level)
+            last_level = level
+            tail_repeat = False
+            track_change(timestamp.timestamp())
+        elif not tail_repeat:
+            new_times.append(timestamp)
+            new_levels.append(last_level)
+            tail_repeat = True
+        elif new_times:
+            new_times[-1] = timestamp
+        else:
+            touch_last_reading(np.datetime64(timestamp, 'ns'))
+    st.session_state.tail_repeat = tail_repeat
+
+    if new_levels:
+        append_readings(
+            np.array(new_times, dtype=TIME_DTYPE),
+            np.array(new_levels, dtype=LEVEL_DTYPE)
+        )
+
+def track_change(changed_at):
+    # Smoothed gap between level changes, used to pace the refreshes
+    if st.session_state.last_change_ts is not None:
+        gap = changed_at - st.session_state.last_change_ts
+        if st.session_state.ewma_gap is None:
+            st.session_state.ewma_gap = gap
+        else:
+            st.session_state.ewma_gap = 0.8 * st.session_state.ewma_gap + 0.2 * gap
+    st.session_state.last_change_ts = changed_at
+
+def refresh_interval(min_interval, now):
+    # Back off while the level is idle, never below the user's interval
+    if st.session_state.ewma_gap is None:
+        return min_interval
+    gap = max(st.session_state.ewma_gap, now - st.session_state.last_change_ts)
+    return float(np.clip(gap * 0.5, min_interval, MAX_REFRESH_INTERVAL))
+
+def render_dashboard():
+    init_state()
+
+    # Firebase initialization
+    try:
+        _firebase_app()
+    except Exception as e:
+        st.error(f"Firebase initialization error: {str(e)}")
+        return
+
+    # Title and description
+    st.title("Smart Container Dashboard")
+    st.markdown("Real-time monitoring of container level using ESP32 ToF sensor")
+
+    # Create layout
+    col1, col2 = st.columns(2)
+
+    # Sidebar controls
+    st.sidebar.title("Dashboard Controls")
+    update_interval = st.sidebar.slider(
+        "Update Interval (seconds)",
+        min_value=1,
+        max_value=60,
+        value=3,
+        key="update_interval"
+    )
+    
+    # Add auto-refresh toggle
+    st.session_state.auto_refresh = st.sidebar.checkbox(
+        "Enable Auto Refresh",
+        value=st.session_state.auto_refresh
+    )
+
+    clear_data = st.sidebar.button("Clear Historical Data")
+    if clear_data:
+        clear_history()
+        _fetch_updated_at.clear()
+        _fetch_data_cached.clear()
+
+    # Manual refresh button
+    if not st.session_state.auto_refresh:
+        if st.sidebar.button("Refresh Data"):
+            st.rerun()
+
+    # Containers for real-time updates
+    with col1:
+        st.subheader("Current Level")
+        level_metric = st.empty()
+        st.markdown("---")
+        st.subheader("Last Update")
+        last_update_text = st.empty()
+
+    with col2:
+        st.subheader("Level History")
+        chart_container = st.empty()
+
+    # Data table and download section
+    st.markdown("---")
+    table_container = st.empty()
+    download_container = st.empty()
+
+    # Read the clock once per run and derive every representation from it
+    now = time.time()
+    now_dt = datetime.fromtimestamp(now)
+
+    try:
+        listener_id, events, _ = _start_listener()
+    except Exception:
+        # Fall back to polling with fetch_data(); failures are not cached,
+        # so the listener is tried again on the next run
+        events = None
+
+    # Schedule the next refresh client-side instead of sleeping on the server
+    refresh_count = None
+    if st.session_state.auto_refresh:
+        interval = update_interval
+        if events is None:
+            # Only polling costs Firebase reads, so only polling backs off
+            interval = refresh_interval(update_interval, now)
+        refresh_count = st_autorefresh(interval=int(interval * 1000), key="tick")
+        st.sidebar.caption(f"Refreshing every {interval:.0f} s")
+
+    # Only fetch on refresh ticks, not on every widget interaction
+    new_tick = refresh_count is None or refresh_count != st.session_state.last_count
+    st.session_state.last_count = refresh_count
+
+    if events is not None:
+        # Consume readings pushed by the listener since the last run
+        latest = events[-1] if events else None
+        pending = new_events(listener_id, events)
+        if not pending and latest is not None and (new_tick or not st.session_state.buf_n):
+            # Firebase only pushes changes, so record the latest value again to
+            # extend the current plateau, or re-seed a cleared history, rather
+            # than waiting for the level to move
+            pending = [(now_dt, latest[2])]
+        record_readings(pending)
+        if latest is None or latest[2] is None:
+            st.warning("No data available from sensor")
+
+    elif new_tick:
+        try:
+            # Real-time data update
+            data = fetch_data(now)
+
+            if data is not None:
+                record_readings([(now_dt, data)])
+            else:
+                st.warning("No data available from sensor")
+
+        except Exception as e:
+            st.error(f"Error fetching data: {str(e)}")
+
+    if st.session_state.buf_n:
+        df = history_frame()
+        signature = history_signature()
+        container_level = df['Distance'].iloc[-1]
+
+        # Update metric, with the delta against the previous refresh tick
+        if new_tick:
+            st.session_state.prev_tick_level = st.session_state.tick_level
+            st.session_state.tick_level = container_level
+        delta = None
+        if st.session_state.prev_tick_level is not None:
+            delta = container_level - st.session_state.prev_tick_level
+
+        level_metric.metric(
+            label="Container Level",
+            value=f"{container_level:.1f}%",
+            delta=f"{delta:.1f}%" if delta is not None else None
+        )
+
+        # Update last update time
+        last_update_text.text(
+            f"Last updated: {st.session_state.last_update.strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+
+        # Update chart
+        chart_container.line_chart(
+            pd.Series(df["Distance"].to_numpy(), index=pd.DatetimeIndex(df["Time"]), name="Distance"),
+            use_container_width=True
+        )
+
+        # Update table, newest first (readings are buffered in time order)
+        table_container.dataframe(
+            df.iloc[::-1],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        # Update download button
+        csv = _csv_bytes(signature, df)
+        download_container.download_button(
+            label="📥 Download Data as CSV",
+            data=csv,
+            file_name=f"container_data_{now_dt.strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )